@@ -1,24 +1,38 @@
-
-import json
 import os
+from functools import lru_cache
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+@lru_cache(maxsize=4)
+def _load(path: str, mtime_ns: int) -> dict:
+    """
+    Parses the JSON file at `path`. The modification time is part of the
+    cache key so that an edited settings file is picked up again.
+    """
+    with open(path, "rb") as f:
+        return json_loads(f.read())
 
 def read_configurations():
     """
-    Reads the configuration settings from a JSON file named 'pyvtt.settings.json' 
+    Reads the configuration settings from a JSON file named 'pyvtt.settings.json'
     located in the same directory as the script.
 
+    The parsed settings are cached per path and modification time, so repeated
+    calls only cost a single `stat` as long as the file is unchanged.
+
     Returns:
         dict: The configuration settings loaded from the JSON file.
 
     Raises:
-        Exception: If there is an error reading or parsing the JSON file, 
+        Exception: If there is an error reading or parsing the JSON file,
                    an exception is raised with the error details.
     """
     script_dir = os.path.dirname(os.path.abspath(__file__))
     settings_path = os.path.join(script_dir, "pyvtt.settings.json")
     try:
-        with open(settings_path) as f:
-            return json.load(f)
+        return _load(settings_path, os.stat(settings_path).st_mtime_ns)
     except Exception as e:
         print(f"Error reading configurations: {e}")
         raise Exception(f"Error reading configurations: {e}")
\ No newline at end of file
@@ -1,5 +1,18 @@
 import subprocess
 
+def notify_cmd(title: str, message: str) -> list:
+    """
+    Builds the `notify-send` command line used by `notify`.
+
+    Args:
+        title (str): The title of the notification.
+        message (str): The message content of the notification.
+
+    Returns:
+        list: The argument vector for `notify-send`.
+    """
+    return ["notify-send", "-a", "Voice to Text", "-i", "audio-input-microphone", title, message]
+
 def notify(title: str, message: str) -> None:
     """
     Sends a desktop notification using the `notify-send` command.
@@ -16,7 +29,7 @@ def notify(title: str, message: str) -> None:
         It is typically available on Linux systems with a notification daemon running.
     """
     try:
-        subprocess.run(["notify-send", "-a", "Voice to Text", "-i", "audio-input-microphone", title, message], check=True)
+        subprocess.run(notify_cmd(title, message), check=True)
     except subprocess.CalledProcessError as e:
         print("Fehler beim Benachrichtigen mit 'notify-send'.")
         print(e)
\ No newline at end of file
@@ -2,17 +2,43 @@
 import socket
 import sys
 import argparse
+import threading
 from configuration import read_configurations
 
 CONFIGURATION = read_configurations()
+_CMDS = {"start": b"start", "stop": b"stop", "toggle": b"toggle"}
+
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+def _acquire_client() -> socket.socket:
+    """
+    Returns the shared datagram client socket, creating it on first use.
+    The caller must hold `_CLIENT_LOCK`.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    return _CLIENT
+
+def _release_client(broken: bool = False) -> None:
+    """
+    Hands the shared client socket back for reuse. A socket that raised
+    an error is closed and dropped so the next call starts fresh.
+    The caller must hold `_CLIENT_LOCK`.
+    """
+    global _CLIENT
+    if broken and _CLIENT is not None:
+        _CLIENT.close()
+        _CLIENT = None
 
 def send_cmd(cmd: str, socket_path: str):
     """
     Sends a command to a Unix domain socket server.
 
-    This function creates a Unix domain socket, connects to the server
-    specified by the socket_path, and sends the provided command as a
-    UTF-8 encoded string.
+    The command is sent as a single UTF-8 encoded datagram to the server
+    specified by the socket_path. The client socket is kept open and reused
+    across calls, so no connection has to be set up per command.
 
     Args:
         cmd (str): The command to send to the server.
@@ -23,16 +49,20 @@ def send_cmd(cmd: str, socket_path: str):
         ConnectionRefusedError: If the connection to the server is refused.
         OSError: For other socket-related errors.
     """
-    try:
-        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
-            client.connect(socket_path)
-            client.sendall(cmd.encode())
-    except FileNotFoundError:
-        print(f"Error: The socket file '{socket_path}' does not exist.", file=sys.stderr)
-    except ConnectionRefusedError:
-        print(f"Error: Connection to the server at '{socket_path}' was refused.", file=sys.stderr)
-    except OSError as e:
-        print(f"Socket error: {e}", file=sys.stderr)
+    with _CLIENT_LOCK:
+        broken = True
+        try:
+            payload = _CMDS.get(cmd) or cmd.encode()
+            _acquire_client().sendto(payload, socket_path)
+            broken = False
+        except FileNotFoundError:
+            print(f"Error: The socket file '{socket_path}' does not exist.", file=sys.stderr)
+        except ConnectionRefusedError:
+            print(f"Error: Connection to the server at '{socket_path}' was refused.", file=sys.stderr)
+        except OSError as e:
+            print(f"Socket error: {e}", file=sys.stderr)
+        finally:
+            _release_client(broken)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -40,7 +70,7 @@ def main():
     )
     parser.add_argument(
         "command",
-        choices=["start", "stop", "toggle"],
+        choices=list(_CMDS),
         nargs="?",
         default="toggle",
         help="The command to send to the server (default: toggle).",
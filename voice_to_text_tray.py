@@ -2,92 +2,197 @@
 import sys
 import subprocess
 import os
+import shlex
+import signal
 import threading
+import time
 import socket
-import json
-import requests
+import atexit
 from PyQt5.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QAction
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import QObject, QThread, QTimer, Qt, pyqtSignal
 from configuration import read_configurations
-from notify import notify
+from notify import notify, notify_cmd
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 CONFIGURATION = read_configurations()
-CURRENT_PRESET = CONFIGURATION["presets"][0]  # Default to first preset
+PRESETS = tuple(CONFIGURATION["presets"])
+_NEWLINE_TO_SPACE = {ord("\n"): ord(" ")}
+# Clipboard und Abschluss-Benachrichtigung in einem einzigen Prozessstart
+_COPY_AND_NOTIFY_CMD = [
+    "sh", "-c",
+    "wl-copy && { "
+    + " ".join(shlex.quote(arg) for arg in notify_cmd("Spracherkennung", "Transkription abgeschlossen!"))
+    + " || true; }"
+]
+
+# Eine dauerhafte Verbindung zu Ollama, statt pro Transkription neu zu verbinden
+_OLLAMA_URL = f"{CONFIGURATION['ollama_url']}:{CONFIGURATION['ollama_port']}/api/generate"
+_OLLAMA = None
+
+# whisper-server hält das Modell geladen, Aufnahmen werden per HTTP hochgeladen
+_WHISPER_SERVER_PATH = CONFIGURATION.get("whisper_server_path", "whisper-server")
+_WHISPER_PORT = CONFIGURATION.get("whisper_port", 8178)
+_WHISPER_URL = f"http://127.0.0.1:{_WHISPER_PORT}/inference"
+_WHISPER_STARTUP_TIMEOUT = 60
+_WHISPER_STOP_TIMEOUT = 5
+_WHISPER = None
+
+def _port_in_use(port):
+    """
+    Checks whether something is already listening on the given local TCP port.
+
+    Args:
+        port (int): The port to check.
+
+    Returns:
+        bool: True if the port cannot be bound, False otherwise.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            probe.bind(("127.0.0.1", port))
+        except OSError:
+            return True
+    return False
+
+_requests = None
+_requests_lock = threading.Lock()
+
+def _lazy_requests():
+    """
+    Imports `requests` on first use and creates the shared HTTP sessions,
+    so starting the tray does not pay for importing requests and urllib3.
+
+    Returns:
+        module: The `requests` module.
+    """
+    global _requests, _OLLAMA, _WHISPER
+    with _requests_lock:
+        if _requests is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _OLLAMA = requests.Session()
+            _OLLAMA.mount(CONFIGURATION["ollama_url"], HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            _WHISPER = requests.Session()
+            _requests = requests
+    return _requests
 
 class WhisperWorker(QThread):
     """
-    A PyQt QThread subclass that handles the transcription of audio files using Whisper 
-    and processes the result with Ollama. The final output is copied to the clipboard 
+    A PyQt QThread subclass that handles the transcription of audio files using a running
+    whisper-server and processes the result with Ollama. The final output is copied to the clipboard 
     and a signal is emitted upon completion.
     Signals:
         finished (pyqtSignal): Emitted with the formatted transcription result as a string 
         when the process is successfully completed.
+        partial (pyqtSignal): Emitted with each text fragment as Ollama streams its answer;
+        the fragments are also printed to stdout by the worker itself.
+    Args:
+        whisper_process (subprocess.Popen or None): The whisper-server process to transcribe with.
+        whisper_language (str): The transcription language of the active preset.
+        ollama_model (str): The Ollama model of the active preset.
+        ollama_prompt (str): The prompt prefix of the active preset.
     Methods:
         run():
             Executes the transcription process using Whisper, sends the result to Ollama 
             for further processing, and copies the final output to the clipboard. Handles 
             errors at various stages and provides notifications for failures.
+        transcribe():
+            Uploads the recorded audio file to whisper-server and returns the transcript,
+            waiting for the server to come up if it is still loading its model. Fails at once
+            if the server process is not running.
     """
     finished = pyqtSignal(str)
+    partial = pyqtSignal(str)
+
+    def __init__(self, whisper_process, whisper_language, ollama_model, ollama_prompt):
+        super().__init__()
+        self.whisper_process = whisper_process
+        self.whisper_language = whisper_language
+        self.ollama_model = ollama_model
+        self.ollama_prompt = ollama_prompt
 
     def run(self):
         try:
+            requests = _lazy_requests()
+
             # Whisper ausführen
-            whisper_cmd = [
-                CONFIGURATION["whisper_path"],
-                "-m", CURRENT_PRESET["whisper_model"],
-                "-f", CONFIGURATION["audio_file"],
-                "-l", CURRENT_PRESET["language"],
-                "-otxt",
-                "-of", CONFIGURATION["output_file"].replace(".txt", "")
-            ]
             try:
-                subprocess.run(whisper_cmd, check=True)
-            except subprocess.CalledProcessError as e:
+                output = self.transcribe()
+            except requests.exceptions.RequestException as e:
                 print(f"Whisper Fehler: {e}")
                 notify("Fehler", "Ein Fehler mit 'Whisper' ist aufgetreten!")
                 return
-            
-            try:
-                with open(CONFIGURATION["output_file"], "r") as f:
-                    raw_result = f.read().strip().replace("\n", " ")
-            except Exception as e:
-                print(f"Datei Fehler: {e}")
-                notify("Fehler", "Ein Fehler beim Lesen der Whisper-Ausgabe ist aufgetreten!")
-                return
-            
+
+            raw_result = output.strip().translate(_NEWLINE_TO_SPACE)
             print("Whisper Transkript erhalten.")
 
             # --- An Ollama schicken ---
             payload = {
-                "model": CURRENT_PRESET["ollama_model"],
-                "prompt": CURRENT_PRESET["ollama_prompt"] + raw_result,
-                "stream": False
+                "model": self.ollama_model,
+                "prompt": self.ollama_prompt + raw_result,
+                "stream": True
             }
-            ollama_endpoint = f"{CONFIGURATION['ollama_url']}:{CONFIGURATION['ollama_port']}/api/generate"
-            response = requests.post(ollama_endpoint, json=payload)
 
+            # wl-copy schon starten, während Ollama noch rechnet
+            formatted_result = None
+            clipboard = subprocess.Popen(_COPY_AND_NOTIFY_CMD, stdin=subprocess.PIPE, start_new_session=True)
             try:
-                response.raise_for_status()
-            except requests.exceptions.HTTPError as e:
-                print(f"HTTP Fehler: {e}")
-                notify("Fehler", "Ein Fehler bei der Kommunikation mit 'Ollama' ist aufgetreten!")
-                return
+                with _OLLAMA.post(_OLLAMA_URL, json=payload, stream=True) as response:
+                    try:
+                        response.raise_for_status()
+                    except requests.exceptions.HTTPError as e:
+                        print(f"HTTP Fehler: {e}")
+                        notify("Fehler", "Ein Fehler bei der Kommunikation mit 'Ollama' ist aufgetreten!")
+                        return
+
+                    # Antwort zeilenweise (NDJSON) lesen und nur das Feld "response" sammeln.
+                    # Der Stream wird bis zum Ende gelesen, damit die Verbindung im Pool bleibt.
+                    fragments = []
+                    done = False
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        chunk = json_loads(line)
+                        if "error" in chunk:
+                            print(f"\nOllama Fehler: {chunk['error']}")
+                            notify("Fehler", "Ein Fehler bei der Kommunikation mit 'Ollama' ist aufgetreten!")
+                            return
+                        if chunk.get("done"):
+                            done = True
+                            continue
+                        fragments.append(chunk["response"])
+                        print(chunk["response"], end="", flush=True)
+                        self.partial.emit(chunk["response"])
 
-            formatted_result = response.json().get("response", "").strip()
-            formatted_result = "\n".join(line.strip() for line in formatted_result.splitlines())
-            print("Ollama Antwort erhalten.")
+                if not done:
+                    print("\nOllama Fehler: Antwort unvollständig.")
+                    notify("Fehler", "Die Antwort von 'Ollama' ist unvollständig!")
+                    return
+
+                formatted_result = "".join(fragments).strip()
+                formatted_result = "\n".join(line.strip() for line in formatted_result.splitlines())
+                print("\nOllama Antwort erhalten.")
+            finally:
+                if formatted_result is None:
+                    # Ohne Ergebnis darf wl-copy die Zwischenablage nicht überschreiben
+                    os.killpg(clipboard.pid, signal.SIGKILL)
+                    clipboard.wait()
 
             # Ergebnis ins Clipboard kopieren
             try:
-                subprocess.run(["wl-copy"], input=formatted_result.encode(), check=True)
+                clipboard.communicate(formatted_result.encode())
+                if clipboard.returncode != 0:
+                    raise subprocess.CalledProcessError(clipboard.returncode, clipboard.args)
             except subprocess.CalledProcessError as e:
                 print(f"Clipboard Fehler: {e}")
                 notify("Fehler", "Ein Fehler beim Kopieren des Ergebnisses ist aufgetreten!")
                 return
-            
-            notify("Spracherkennung", "Transkription abgeschlossen!")
+
             self.finished.emit(formatted_result)
 
         except Exception as e:
@@ -95,45 +200,64 @@ class WhisperWorker(QThread):
             notify("Fehler", "Ein Fehler ist aufgetreten!")
             return
 
+    def transcribe(self):
+        requests = _lazy_requests()
+        # Der Server lädt nach einem Start evtl. noch das Modell
+        deadline = time.monotonic() + _WHISPER_STARTUP_TIMEOUT
+        while True:
+            if self.whisper_process is None or self.whisper_process.poll() is not None:
+                raise requests.exceptions.ConnectionError("whisper-server läuft nicht.")
+            try:
+                with open(CONFIGURATION["audio_file"], "rb") as audio:
+                    response = _WHISPER.post(
+                        _WHISPER_URL,
+                        files={"file": audio},
+                        data={"language": self.whisper_language, "response_format": "text"}
+                    )
+                break
+            except requests.exceptions.ConnectionError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.2)
+        response.raise_for_status()
+        return response.text
+
+class _ListenerSignals(QObject):
+    command = pyqtSignal(bytes)
+
 class SocketListener(threading.Thread):
     """
     A thread-based socket listener for handling inter-process communication
-    via a UNIX domain socket. This class listens for specific commands
-    ("toggle", "start", "stop") sent to the socket and triggers corresponding
-    methods in the provided tray application instance.
+    via a UNIX datagram socket. This class receives commands ("toggle",
+    "start", "stop") sent to the socket and forwards them through a Qt
+    signal, so they are handled on the Qt main thread.
 
     Attributes:
-        tray_app (object): The tray application instance that provides methods
-            for handling recording actions.
-        sock (socket.socket): The UNIX domain socket used for communication.
+        sock (socket.socket): The UNIX datagram socket used for communication.
+        signals (_ListenerSignals): Holds the `command` signal, emitted with the
+            raw command bytes of each received datagram.
 
     Methods:
         run():
-            Continuously listens for incoming connections on the socket.
-            Processes received commands and invokes the appropriate methods
-            on the tray application instance.
+            Continuously receives datagrams on the socket and emits their
+            commands.
     """
-    def __init__(self, tray_app):
+    def __init__(self):
         super().__init__(daemon=True)
-        self.tray_app = tray_app
-        if os.path.exists(CONFIGURATION["socket_path"]):
-            os.remove(CONFIGURATION["socket_path"])
-        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Im Hauptthread erzeugt, damit verbundene Slots dort ausgeführt werden
+        self.signals = _ListenerSignals()
+        try:
+            os.unlink(CONFIGURATION["socket_path"])
+        except FileNotFoundError:
+            pass
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
         self.sock.bind(CONFIGURATION["socket_path"])
         os.chmod(CONFIGURATION["socket_path"], 0o666)
-        self.sock.listen(1)
 
     def run(self):
         while True:
-            conn, _ = self.sock.accept()
-            with conn:
-                data = conn.recv(1024).decode().strip()
-                if data == "toggle":
-                    self.tray_app.toggle_recording()
-                elif data == "start":
-                    self.tray_app.start_recording()
-                elif data == "stop":
-                    self.tray_app.stop_recording_if_possible()
+            data, _ = self.sock.recvfrom(16)
+            self.signals.command.emit(data.strip())
 
 class TrayApp:
     """
@@ -150,16 +274,19 @@ class TrayApp:
         recording_process (subprocess.Popen or None): The process handling audio recording.
         socket_listener (SocketListener): A listener for socket communication.
         worker (WhisperWorker or None): A worker thread for processing audio with Whisper.
+        whisper_process (subprocess.Popen or None): The whisper-server holding the preset's model.
 
     Methods:
         __init__(): Initializes the TrayApp instance, setting up the system tray, menu, and socket listener.
         set_preset(index): Sets the active preset based on the given index and updates the UI.
+            Refused while a WhisperWorker is running, since a model change restarts whisper-server.
         start_recording(): Starts audio recording using ffmpeg.
         stop_recording_if_possible(): Stops the audio recording process if it is running.
+        handle_command(data): Runs the action for a command received by the SocketListener.
         toggle_recording(): Toggles between starting and stopping the audio recording.
         start_whisper_worker(): Starts a WhisperWorker thread to process the recorded audio.
-        show_result(text): Displays the processed text result from the WhisperWorker.
-        cleanup(): Cleans up resources, such as removing the socket file, before the application exits.
+        show_result(text): Ends the streamed output once the WhisperWorker has finished.
+        cleanup(): Cleans up resources, such as removing the socket file and stopping whisper-server, before the application exits.
         run(): Starts the application's event loop.
     """
     def __init__(self):
@@ -169,18 +296,32 @@ class TrayApp:
 
         self.app.aboutToQuit.connect(self.cleanup)
 
+        # whisper-server soll nicht verwaist weiterlaufen: SIGTERM/SIGINT beenden
+        # die App regulär (inkl. cleanup), atexit fängt sonstige Beendigungen ab
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: self.app.quit())
+        # Python-Signalhandler laufen nur, wenn der Interpreter zwischendurch aktiv ist
+        self._signal_timer = QTimer()
+        self._signal_timer.timeout.connect(lambda: None)
+        self._signal_timer.start(500)
+
         # Preset Menü
         self.preset_actions = []
         self.preset_group = QMenu("Presets")
-        for i, preset in enumerate(CONFIGURATION["presets"]):
+        for i, preset in enumerate(PRESETS):
             action = QAction(preset["name"], self.menu)
             action.setCheckable(True)
-            if i == 0:
-                action.setChecked(True)
             action.triggered.connect(lambda checked, index=i: self.set_preset(index))
             self.preset_group.addAction(action)
             self.preset_actions.append(action)
         self.menu.addMenu(self.preset_group)
+        self._current_action = self.preset_actions[0]
+        self._current_action.setChecked(True)
+        self.worker = None
+        self.whisper_process = None
+        self._whisper_model = None
+        atexit.register(self._stop_whisper_server)
+        self._load_preset(0)
 
         # Quit
         self.quit_action = QAction("Beenden")
@@ -193,23 +334,80 @@ class TrayApp:
 
         self.recording_process = None
 
-        self.socket_listener = SocketListener(self)
+        # Befehle laufen über den Qt-Hauptthread, damit Aufnahme-, Worker- und
+        # Serverzustand nur von einem Thread verändert werden
+        self._dispatch = {
+            b"toggle": self.toggle_recording,
+            b"start": self.start_recording,
+            b"stop": self.stop_recording_if_possible,
+        }
+        self.socket_listener = SocketListener()
+        self.socket_listener.signals.command.connect(self.handle_command, Qt.QueuedConnection)
         self.socket_listener.start()
 
+    def _load_preset(self, index):
+        # Alles, was sich nur beim Presetwechsel ändert, einmalig vorberechnen
+        preset = PRESETS[index]
+        self._preset_model = preset["whisper_model"]
+        if self._preset_model != self._whisper_model:
+            self._start_whisper_server(self._preset_model)
+        self._whisper_language = preset.get("language", CONFIGURATION["language"])
+        self._ollama_model = preset["ollama_model"]
+        self._ollama_prompt = preset["ollama_prompt"]
+
+    def _start_whisper_server(self, model):
+        self._stop_whisper_server()
+        if _port_in_use(_WHISPER_PORT):
+            print(f"whisper-server Fehler: Port {_WHISPER_PORT} ist bereits belegt.")
+            notify("Fehler", f"Port {_WHISPER_PORT} für 'whisper-server' ist bereits belegt!")
+            return
+        print(f"Starte whisper-server mit {model}...")
+        try:
+            self.whisper_process = subprocess.Popen([
+                _WHISPER_SERVER_PATH, "-m", model,
+                "--host", "127.0.0.1", "--port", str(_WHISPER_PORT)
+            ])
+        except OSError as e:
+            print(f"whisper-server Fehler: {e}")
+            notify("Fehler", "'whisper-server' konnte nicht gestartet werden!")
+            return
+        self._whisper_model = model
+
+    def _stop_whisper_server(self):
+        if self.whisper_process:
+            self.whisper_process.terminate()
+            try:
+                self.whisper_process.wait(timeout=_WHISPER_STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self.whisper_process.kill()
+                self.whisper_process.wait()
+        self.whisper_process = None
+        self._whisper_model = None
+
+    def _worker_running(self):
+        return self.worker is not None and self.worker.isRunning()
+
     def set_preset(self, index):
-        global CURRENT_PRESET
-        print(f"Preset gewechselt: {CONFIGURATION['presets'][index]['name']}")
-        CURRENT_PRESET = CONFIGURATION["presets"][index]
+        if self._worker_running():
+            # Ein Modellwechsel würde die laufende Transkription abbrechen
+            print("Presetwechsel während der Transkription nicht möglich.")
+            notify("Preset", "Presetwechsel während der Transkription nicht möglich!")
+            self.preset_actions[index].setChecked(self.preset_actions[index] is self._current_action)
+            return
+        print(f"Preset gewechselt: {PRESETS[index]['name']}")
+        self._load_preset(index)
         # Nur einer darf gecheckt sein
-        for i, action in enumerate(self.preset_actions):
-            action.setChecked(i == index)
+        self._current_action.setChecked(False)
+        self._current_action = self.preset_actions[index]
+        self._current_action.setChecked(True)
 
     def start_recording(self):
         if self.recording_process is None:
             print("Starte Aufnahme...")
             self.recording_process = subprocess.Popen([
-                "ffmpeg", "-f", "pulse", "-i", "default", "-ar", "16000",
-                "-ac", "1", CONFIGURATION["audio_file"], "-y", "-loglevel", "quiet"
+                "ffmpeg", "-nostdin", "-hide_banner", "-f", "pulse", "-i", "default",
+                "-ar", "16000", "-ac", "1", "-c:a", "pcm_s16le", "-f", "wav",
+                "-y", CONFIGURATION["audio_file"], "-loglevel", "quiet"
             ])
             notify("Aufnahme", "Aufnahme gestartet!")
 
@@ -222,6 +420,11 @@ class TrayApp:
             notify("Aufnahme", "Aufnahme beendet, verarbeite...")
             self.start_whisper_worker()
 
+    def handle_command(self, data):
+        handler = self._dispatch.get(data)
+        if handler:
+            handler()
+
     def toggle_recording(self):
         if self.recording_process:
             self.stop_recording_if_possible()
@@ -229,16 +432,23 @@ class TrayApp:
             self.start_recording()
 
     def start_whisper_worker(self):
-        self.worker = WhisperWorker()
+        # Abgestürzten oder nie gestarteten Server erneut starten
+        if self.whisper_process is None or self.whisper_process.poll() is not None:
+            self._start_whisper_server(self._preset_model)
+        self.worker = WhisperWorker(self.whisper_process, self._whisper_language, self._ollama_model, self._ollama_prompt)
         self.worker.finished.connect(self.show_result)
         self.worker.start()
 
     def show_result(self, text):
-        print(f"Fertig:\n{text}")
+        # Der Text wurde bereits beim Streamen ausgegeben
+        print("Fertig.")
 
     def cleanup(self):
-        if os.path.exists(CONFIGURATION["socket_path"]):
-            os.remove(CONFIGURATION["socket_path"])
+        self._stop_whisper_server()
+        try:
+            os.unlink(CONFIGURATION["socket_path"])
+        except FileNotFoundError:
+            pass
         print("Socket sauber entfernt.")
 
     def run(self):